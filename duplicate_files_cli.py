@@ -16,16 +16,82 @@ Pure Python file duplication tool with:
 
 import os
 import sys
+import errno
+import atexit
 import shutil
-import json
+import threading
+import mmap
+import tempfile
+import sqlite3
 import zipfile
+import zlib
+import hashlib
 import uuid
 import argparse
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from itertools import islice
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 
-RESUME_FILE = ".resume_state.json"
+try:
+    import fcntl
+    import posix
+except ImportError:  # Windows
+    fcntl = posix = None
+
+try:
+    import liburing
+except ImportError:  # optional: pip install liburing
+    liburing = None
+
+RESUME_FILE = ".resume_state.db"
+
+# Destinations handed to a worker per executor call
+BATCH_SIZE = 1000
+# Upper bound on finished copies a crash can lose under --resume: in-flight
+# batches are sized so that together they hold about this many files
+CHECKPOINT_EVERY = 500
+# More threads than this only add contention on IO-bound copies
+MAX_WORKERS = 8
+
+# Chunk size for sendfile / write loops
+_BUF = 1 << 20
+
+# --zip-compression choice -> (zipfile method, compresslevel).
+# Every file in a bundle is a copy of a few sources, so "stored" costs
+# almost nothing beyond the IO; deflate-fast trades ratio for speed.
+ZIP_COMPRESSION = {
+    "stored": (zipfile.ZIP_STORED, None),
+    "deflate": (zipfile.ZIP_DEFLATED, None),
+    "deflate-fast": (zipfile.ZIP_DEFLATED, 1),
+}
+
+# Largest file zip_chunks will read into memory to reuse its deflate stream
+PRECOMPRESS_LIMIT = 64 << 20
+# Total size of the deflate streams zip_chunks keeps for reuse
+BLOB_CACHE_LIMIT = 256 << 20
+
+# Destinations per io_uring submission; each is an open/write/close chain
+URING_BATCH = 256
+# Larger sources skip io_uring, which writes from an in-memory copy
+URING_MAX_SIZE = 64 << 20
+
+# Linux ioctl for reflink clones (Btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# errno values meaning "this fast path is not available here"
+_FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EPERM,
+    errno.EBADF,
+}
 
 
 # -----------------------------
@@ -36,6 +102,23 @@ def die(msg):
     sys.exit(1)
 
 
+def source_digest(path):
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        for chunk in iter(lambda: f.read(_BUF), b""):
+            h.update(chunk)
+        return h.hexdigest()
+
+
+def same_size(path, size):
+    try:
+        return os.stat(path).st_size == size
+    except OSError:
+        return False
+
+
 def is_positive_int(value):
     try:
         iv = int(value)
@@ -44,27 +127,554 @@ def is_positive_int(value):
         return False
 
 
-def load_resume(output_dir):
-    path = output_dir / RESUME_FILE
-    if path.exists():
-        with open(path, "r") as f:
-            return set(json.load(f))
-    return set()
+def open_resume(output_dir):
+    conn = sqlite3.connect(output_dir / RESUME_FILE)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS done(name TEXT PRIMARY KEY)")
+    return conn
+
+
+def peek_resume(output_dir):
+    """Completed names for a dry run: read-only, never creates the db."""
+    path = (output_dir / RESUME_FILE).resolve()
+    if not path.exists():
+        return set()
+    # Without a pending WAL, immutable=1 also stops SQLite from creating
+    # the -wal/-shm files that a read-only WAL open would otherwise leave
+    query = "mode=ro"
+    if not os.path.exists(f"{path}-wal"):
+        query += "&immutable=1"
+    conn = sqlite3.connect(f"{path.as_uri()}?{query}", uri=True)
+    try:
+        return load_resume(conn)
+    finally:
+        conn.close()
+
+
+def load_resume(conn):
+    return {name for (name,) in conn.execute("SELECT name FROM done")}
+
+
+def save_resume(conn, names):
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO done(name) VALUES (?)",
+            ((name,) for name in names),
+        )
+
+
+# -----------------------------
+# Fast copy
+# -----------------------------
+_local = threading.local()
+_open_sources = []
+_sources_lock = threading.Lock()
+_writev_ok = hasattr(os, "writev")
+# sysconf reports -1 when the limit is indeterminate
+_IOV_MAX = max(1, os.sysconf("SC_IOV_MAX") if hasattr(os, "sysconf") else 16)
+
+_O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+@atexit.register
+def _close_sources():
+    with _sources_lock:
+        while _open_sources:
+            fd, mm, _ = _open_sources.pop()
+            if mm is not None:
+                mm.close()
+            os.close(fd)
+
+
+def _source(src):
+    """
+    Return (fd, mmap, size) for src, opened and mapped once per worker
+    thread. The mmap is None for empty files, which cannot be mapped.
+    """
+    cache = getattr(_local, "sources", None)
+    if cache is None:
+        cache = _local.sources = {}
+
+    entry = cache.get(src)
+    if entry is None:
+        fd = os.open(src, os.O_RDONLY | _O_BINARY)
+        size = os.fstat(fd).st_size
+        mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ) if size else None
+        entry = cache[src] = (fd, mm, size)
+        with _sources_lock:
+            _open_sources.append(entry)
+    return entry
+
+
+# Each _copy_* takes (src_fd, mm, size, dst_fd) and fills dst_fd with the
+# source's bytes. An OSError in _FALLBACK_ERRNOS means "not here".
+def _copy_reflink(src_fd, mm, size, dst_fd):
+    fcntl.ioctl(dst_fd, FICLONE, src_fd)
+
+
+def _copy_range(src_fd, mm, size, dst_fd):
+    offset = 0
+    while offset < size:
+        sent = os.copy_file_range(src_fd, dst_fd, size - offset, offset, offset)
+        if sent == 0:
+            # Some FUSE/virtual filesystems and older kernels report "no
+            # support" as a 0-byte copy; fall through to the next mechanism
+            raise OSError(errno.EINVAL, "copy_file_range made no progress")
+        offset += sent
+
+
+def _copy_sendfile(src_fd, mm, size, dst_fd):
+    offset = 0
+    while offset < size:
+        sent = os.sendfile(dst_fd, src_fd, offset, min(_BUF, size - offset))
+        if sent == 0:
+            raise OSError(errno.EINVAL, "sendfile made no progress")
+        offset += sent
+
+
+def _copy_fcopyfile(src_fd, mm, size, dst_fd):
+    # macOS copyfile(3), the same call shutil uses internally there. It
+    # reads from the fd's current offset, and the source fd is reused by
+    # every copy on this thread, so start from the top each time.
+    os.lseek(src_fd, 0, os.SEEK_SET)
+    posix._fcopyfile(src_fd, dst_fd, posix._COPYFILE_DATA)
+
+
+def _copy_mapped(src_fd, mm, size, dst_fd):
+    """
+    Write the mapped source straight from the page cache. With writev the
+    map goes out as 1 MiB iovecs, up to IOV_MAX per call, so most files
+    take a single syscall and no read side at all.
+    """
+    view = memoryview(mm)
+    try:
+        while view:
+            if _writev_ok:
+                end = min(len(view), _BUF * _IOV_MAX)
+                iov = [view[i:i + _BUF] for i in range(0, end, _BUF)]
+                written = os.writev(dst_fd, iov)
+            else:
+                written = os.write(dst_fd, view[:_BUF])
+            if not written:
+                raise OSError(errno.EIO, "write made no progress")
+            view = view[written:]
+    finally:
+        view.release()
+
+
+_linux = sys.platform.startswith("linux")
+
+# Copy mechanisms this OS offers, cheapest first. _copy_data is bound to
+# the first one, so the per-file path has no capability checks; specialize()
+# narrows the list further for the actual output filesystem.
+_tiers = [
+    copy
+    for copy, ok in (
+        (_copy_reflink, _linux and fcntl is not None),
+        (_copy_range, hasattr(os, "copy_file_range")),
+        (_copy_sendfile, _linux and hasattr(os, "sendfile")),
+        (_copy_fcopyfile, hasattr(posix, "_fcopyfile")),
+    )
+    if ok
+] + [_copy_mapped]
+_copy_data = _tiers[0]
+
+
+def _demote(copy):
+    """Drop a mechanism that turned out not to work here and rebind."""
+    global _copy_data
+    with _sources_lock:
+        if copy in _tiers and copy is not _copy_mapped:
+            _tiers.remove(copy)
+        _copy_data = _tiers[0]
+
+
+def _rewind(fd):
+    # A mechanism can fail after writing part of the file (and moving the
+    # offset); the next one must start from an empty file.
+    os.ftruncate(fd, 0)
+    os.lseek(fd, 0, os.SEEK_SET)
+
+
+def _copy_fd(src_fd, mm, size, dst_fd):
+    if not size:
+        return
+
+    while True:
+        copy = _copy_data
+        try:
+            return copy(src_fd, mm, size, dst_fd)
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRNOS or copy is _copy_mapped:
+                raise
+            _demote(copy)
+            _rewind(dst_fd)
+
+
+def specialize(source, output_dir):
+    """
+    Probe the copy mechanisms once against a real source and the output
+    filesystem (reflink, for one, depends on both), dropping those that
+    fail, so worker threads never hit the failing paths themselves.
+    """
+    src_fd, mm, size = _source(source)
+    if not size:
+        return
+
+    fd, probe = tempfile.mkstemp(dir=output_dir, prefix=".probe_")
+    try:
+        while _copy_data is not _copy_mapped:
+            copy = _copy_data
+            try:
+                _rewind(fd)
+                copy(src_fd, mm, size, fd)
+                return
+            except OSError as e:
+                if e.errno not in _FALLBACK_ERRNOS:
+                    raise
+                _demote(copy)
+    finally:
+        os.close(fd)
+        os.unlink(probe)
+
+
+def fastcopy(src, dst):
+    src_fd, mm, size = _source(src)
+    dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | _O_BINARY, 0o644)
+    try:
+        _copy_fd(src_fd, mm, size, dst_fd)
+    finally:
+        os.close(dst_fd)
+    shutil.copystat(src, dst)
+
+
+def reflink(src, dst):
+    """Clone src into dst with FICLONE; unlike fastcopy, never falls back."""
+    src_fd, _, _ = _source(src)
+    dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    except OSError:
+        os.close(dst_fd)
+        os.unlink(dst)
+        raise
+    os.close(dst_fd)
+    shutil.copystat(src, dst)
+
+
+def probe_mode(mode, sources, output_dir):
+    """
+    Try a link/clone mode once per source into output_dir, so an
+    unsupported mode (no FICLONE, hard links across filesystems) stops
+    the run before any worker starts.
+    """
+    fd, probe = tempfile.mkstemp(dir=output_dir, prefix=".probe_")
+    os.close(fd)
+    os.unlink(probe)
+    for src in sources:
+        try:
+            COPIERS[mode](src, probe)
+        except OSError as e:
+            die(f"--mode {mode} is not supported on {output_dir}: {e.strerror}")
+        finally:
+            if os.path.lexists(probe):
+                os.unlink(probe)
 
 
-def save_resume(output_dir, completed):
-    path = output_dir / RESUME_FILE
-    with open(path, "w") as f:
-        json.dump(sorted(completed), f)
+def _link(make, target, dst):
+    # Links can't overwrite, unlike copies; replace what a previous run left
+    try:
+        make(target, dst)
+    except FileExistsError:
+        os.unlink(dst)
+        make(target, dst)
+
+
+# -----------------------------
+# io_uring backend
+# -----------------------------
+_rings = []
+_blobs = {}
+
+
+@atexit.register
+def _close_rings():
+    with _sources_lock:
+        while _rings:
+            liburing.io_uring_queue_exit(_rings.pop())
+
+
+def _ring():
+    """Return this worker thread's ring, with URING_BATCH direct file slots."""
+    ring = getattr(_local, "ring", None)
+    if ring is None:
+        ring = liburing.Ring()
+        liburing.io_uring_queue_init(URING_BATCH * 4, ring)
+        with _sources_lock:
+            _rings.append(ring)
+        liburing.io_uring_register_files_sparse(ring, URING_BATCH)
+        _local.ring = ring
+    return ring
+
+
+def _source_bytes(src):
+    """
+    Source contents as bytes, or None if too large. One copy per source
+    is shared by all workers; the bytes are never written to.
+    """
+    data = _blobs.get(src, False)
+    if data is False:
+        _, mm, size = _source(src)
+        with _sources_lock:
+            if src not in _blobs:
+                _blobs[src] = None if size > URING_MAX_SIZE else (mm[:] if mm else b"")
+            data = _blobs[src]
+    return data
+
+
+def _uring_copy(ring, cqe, chunk):
+    """
+    Copy up to URING_BATCH destinations with one submission. Each
+    destination is a linked open_direct -> write -> close_direct chain on
+    its own fixed-file slot. Returns the (src, dst) pairs that still need
+    a regular copy (large sources, short writes).
+    """
+    fallback = []
+    queued = []
+    flags = liburing.O_WRONLY | liburing.O_CREAT | liburing.O_TRUNC
+
+    for src, dst, _ in chunk:
+        data = _source_bytes(src)
+        if data is None:
+            fallback.append((src, dst))
+            continue
+
+        # user_data = 3 * slot + step; dst and data must stay referenced
+        # until the kernel has consumed them.
+        slot = len(queued)
+        queued.append((src, dst, data))
+
+        sqe = liburing.io_uring_get_sqe(ring)
+        liburing.io_uring_prep_open_direct(sqe, dst, flags, slot, 0o644)
+        liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_IO_LINK)
+        liburing.io_uring_sqe_set_data64(sqe, 3 * slot)
+
+        sqe = liburing.io_uring_get_sqe(ring)
+        liburing.io_uring_prep_write(sqe, slot, data, 0)
+        # Hard link: the slot is closed even when the write fails
+        liburing.io_uring_sqe_set_flags(
+            sqe, liburing.IOSQE_FIXED_FILE | liburing.IOSQE_IO_HARDLINK
+        )
+        liburing.io_uring_sqe_set_data64(sqe, 3 * slot + 1)
+
+        sqe = liburing.io_uring_get_sqe(ring)
+        liburing.io_uring_prep_close_direct(sqe, slot)
+        liburing.io_uring_sqe_set_data64(sqe, 3 * slot + 2)
+
+    if not queued:
+        return fallback
+
+    want = 3 * len(queued)
+    liburing.io_uring_submit_and_wait(ring, want)
+
+    error = None
+    short = set()
+    for _ in range(want):
+        liburing.io_uring_wait_cqe(ring, cqe)
+        entry = cqe[0]
+        slot, step = divmod(entry.user_data, 3)
+        try:
+            # liburing raises OSError for a negative result
+            res = entry.res
+        except OSError as e:
+            if e.errno != errno.ECANCELED and error is None:
+                error = OSError(e.errno, os.strerror(e.errno), queued[slot][1])
+        else:
+            if step == 1 and res < len(queued[slot][2]):
+                short.add(slot)
+        finally:
+            liburing.io_uring_cq_advance(ring, 1)
+
+    if error is not None:
+        raise error
+
+    for slot, (src, dst, _) in enumerate(queued):
+        if slot in short:
+            fallback.append((src, dst))
+        else:
+            shutil.copystat(src, dst)
+    return fallback
+
+
+def copy_batch_uring(batch):
+    ring = _ring()
+    cqe = liburing.Cqe()
+    for i in range(0, len(batch), URING_BATCH):
+        for src, dst in _uring_copy(ring, cqe, batch[i:i + URING_BATCH]):
+            fastcopy(src, dst)
+    return [name for _, _, name in batch]
+
+
+def uring_available():
+    if liburing is None or not sys.platform.startswith("linux"):
+        return False
+    # Probe on a throwaway ring; workers set up their own in _ring()
+    ring = liburing.Ring()
+    try:
+        liburing.io_uring_queue_init(URING_BATCH * 4, ring)
+    except OSError:
+        return False
+    try:
+        liburing.io_uring_register_files_sparse(ring, URING_BATCH)
+    except OSError:
+        return False
+    finally:
+        liburing.io_uring_queue_exit(ring)
+    return True
 
 
 # -----------------------------
 # File generation
 # -----------------------------
-def copy_one(src, dst):
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dst)
-    return dst.name
+def hardlink(src, dst):
+    _link(os.link, src, dst)
+
+
+def symlink(src, dst):
+    _link(os.symlink, os.path.abspath(src), dst)
+
+
+# --mode -> copy function, resolved once per run rather than per file
+COPIERS = {
+    "copy": fastcopy,
+    "reflink": reflink,
+    "hardlink": hardlink,
+    "symlink": symlink,
+}
+
+
+def copy_batch(batch, copy=fastcopy):
+    for src, dst, _ in batch:
+        copy(src, dst)
+    return [name for _, _, name in batch]
+
+
+def batched(tasks, size):
+    while batch := list(islice(tasks, size)):
+        yield batch
+
+
+def map_bounded(exe, fn, items, window):
+    """
+    Like exe.map, but pulls from items lazily and keeps at most window
+    calls in flight, so a generator of tasks is never fully materialized.
+    """
+    inflight = deque()
+    for item in items:
+        if len(inflight) >= window:
+            yield inflight.popleft().result()
+        inflight.append(exe.submit(fn, item))
+    while inflight:
+        yield inflight.popleft().result()
+
+
+def default_workers():
+    return min(MAX_WORKERS, os.cpu_count() or 1)
+
+
+def is_rotational(path):
+    """
+    True if path lives on a spinning disk, False if not, None when the
+    device can't be identified (non-Linux, tmpfs, overlay, ...).
+    """
+    try:
+        st = os.stat(path)
+        dev = f"/sys/dev/block/{os.major(st.st_dev)}:{os.minor(st.st_dev)}"
+        real = os.path.realpath(dev)
+    except (OSError, AttributeError):
+        return None
+
+    # Partitions have no queue/ of their own; it lives on the parent disk
+    for d in (real, os.path.dirname(real)):
+        try:
+            with open(os.path.join(d, "queue", "rotational")) as f:
+                return f.read().strip() == "1"
+        except OSError:
+            continue
+    return None
+
+
+def pick_workers(output_dir, workers):
+    """
+    Choose the worker count when --workers isn't given. Parallel copies
+    onto a spinning disk only add seeks, so those runs stay sequential.
+    An explicit worker count is always used as given.
+    """
+    if workers:
+        return workers
+
+    if is_rotational(output_dir):
+        print(f"INFO: {output_dir} is on a rotational disk, using 1 worker")
+        return 1
+
+    workers = default_workers()
+    print(f"INFO: using {workers} worker(s)")
+    return workers
+
+
+def iter_tasks(
+    sources,
+    copies,
+    output_dir,
+    per_subfolder,
+    completed,
+    resume,
+    randomize,
+    uuid_strict,
+):
+    """
+    Yield (src, dst, name) for every copy still to be made. Paths are
+    plain strings built by concatenation; Path arithmetic per copy is
+    measurable at tens of thousands of files.
+    """
+    out = str(output_dir) + os.sep
+    if per_subfolder > 0:
+        parts = (copies - 1) // per_subfolder + 1
+        folders = [f"{out}part_{idx}{os.sep}" for idx in range(1, parts + 1)]
+
+    for src in sources:
+        stem = src.stem
+        suffix = src.suffix
+        size = src.stat().st_size
+        src_str = str(src)
+
+        if resume and randomize:
+            # Random names can't be matched on a later run; name copies
+            # after the source content instead so resume still works.
+            stem = f"{stem}_{source_digest(src)[:8]}"
+        elif randomize and not uuid_strict:
+            # One urandom call per source, 64 random bits per name
+            rand = os.urandom(8 * copies).hex()
+
+        for i in range(1, copies + 1):
+            if not randomize or resume:
+                name = f"{stem}_{i}{suffix}"
+            elif uuid_strict:
+                name = f"{stem}_{uuid.uuid4().hex}{suffix}"
+            else:
+                name = f"{stem}_{rand[16 * (i - 1):16 * i]}{suffix}"
+
+            if per_subfolder > 0:
+                dst = folders[(i - 1) // per_subfolder] + name
+            else:
+                dst = out + name
+
+            # A recorded copy with the wrong size was cut short; redo it
+            if name in completed and same_size(dst, size):
+                continue
+
+            yield src_str, dst, name
 
 
 def generate_files(
@@ -77,59 +687,85 @@ def generate_files(
     resume,
     randomize,
     max_limit,
+    uuid_strict=False,
+    backend="fastcopy",
+    mode="copy",
 ):
-    completed = load_resume(output_dir) if resume else set()
-    tasks = []
-
     total = len(sources) * copies
     if total > max_limit:
         die(f"Requested {total} files exceeds limit {max_limit}")
 
+    sources = [Path(src) for src in sources]
     for src in sources:
-        src = Path(src)
         if not src.exists():
             die(f"Source not found: {src}")
 
-        stem = src.stem
-        suffix = src.suffix
-
-        for i in range(1, copies + 1):
-            name = (
-                f"{stem}_{uuid.uuid4().hex}{suffix}"
-                if randomize
-                else f"{stem}_{i}{suffix}"
-            )
-
-            if name in completed:
-                continue
-
-            if per_subfolder > 0:
-                idx = (i - 1) // per_subfolder + 1
-                dst = output_dir / f"part_{idx}" / name
-            else:
-                dst = output_dir / name
-
-            tasks.append((src, dst, name))
+    db = open_resume(output_dir) if resume and not dry_run else None
+    if db:
+        completed = load_resume(db)
+    elif resume:
+        completed = peek_resume(output_dir)
+    else:
+        completed = set()
+    make_tasks = partial(
+        iter_tasks, sources, copies, output_dir, per_subfolder,
+        completed, resume, randomize, uuid_strict,
+    )
 
     if dry_run:
-        print(f"[DRY-RUN] Would generate {len(tasks)} files")
+        print(f"[DRY-RUN] Would generate {sum(1 for _ in make_tasks())} files")
         return completed
 
-    with ThreadPoolExecutor(max_workers=workers) as exe:
-        futures = {
-            exe.submit(copy_one, src, dst): name
-            for src, dst, name in tasks
-        }
-
-        with tqdm(total=len(futures), unit="file") as bar:
-            for fut in as_completed(futures):
-                name = futures[fut]
-                fut.result()
-                completed.add(name)
-                bar.update(1)
-
-    if resume:
-        save_resume(output_dir, completed)
+    if per_subfolder > 0:
+        for idx in range(1, (copies - 1) // per_subfolder + 2):
+            (output_dir / f"part_{idx}").mkdir(parents=True, exist_ok=True)
+    else:
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+    if mode == "copy":
+        specialize(str(sources[0]), output_dir)
+    else:
+        probe_mode(mode, [str(src) for src in sources], output_dir)
+
+    # Recorded names may belong to other runs or be redone after the size
+    # check, so with resume state the real count needs one pass of its own.
+    remaining = sum(1 for _ in make_tasks()) if completed else total
+    tasks = make_tasks()
+
+    # Large batches keep per-task executor overhead low, but never so large
+    # that some workers sit idle on small runs. Under --resume, a batch is
+    # only recorded once it returns, so everything in flight is what a crash
+    # loses; keep that near CHECKPOINT_EVERY.
+    window = 2 * workers
+    size = max(1, min(BATCH_SIZE, -(-remaining // workers)))
+    if db:
+        size = min(size, max(1, CHECKPOINT_EVERY // window))
+
+    # Batches come back in submission order; anything finished before a
+    # failure is still recorded for the next --resume run.
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as exe:
+            # At most ~200 redraws per run; tqdm's lock and rendering
+            # otherwise show up once copies are fast.
+            with tqdm(
+                total=remaining,
+                unit="file",
+                mininterval=0.5,
+                miniters=max(1, remaining // 200),
+            ) as bar:
+                batches = batched(tasks, size)
+                if mode == "copy" and backend == "uring":
+                    run = copy_batch_uring
+                else:
+                    run = partial(copy_batch, copy=COPIERS[mode])
+                for names in map_bounded(exe, run, batches, window):
+                    completed.update(names)
+                    bar.update(len(names))
+                    if db:
+                        save_resume(db, names)
+    finally:
+        if db:
+            db.close()
 
     return completed
 
@@ -137,22 +773,98 @@ def generate_files(
 # -----------------------------
 # ZIP chunking
 # -----------------------------
-def zip_chunks(output_dir, chunk_size):
-    files = sorted(
-        p for p in output_dir.rglob("*")
-        if p.is_file() and p.name != RESUME_FILE
-    )
-
-    if not files:
+def _deflate(data, level):
+    c = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return c.compress(data) + c.flush()
+
+
+def _write_precompressed(z, zinfo, blob):
+    """
+    Append a member whose raw deflate stream was produced elsewhere.
+    Mirrors ZipFile._open_to_write / _ZipWriteFile.close, minus the
+    compressor.
+    """
+    zip64 = max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+    with z._lock:
+        z.fp.seek(z.start_dir)
+        zinfo.header_offset = z.fp.tell()
+        z._writecheck(zinfo)
+        z._didModify = True
+        z.fp.write(zinfo.FileHeader(zip64))
+        z.fp.write(blob)
+        z.start_dir = z.fp.tell()
+        z.filelist.append(zinfo)
+        z.NameToInfo[zinfo.filename] = zinfo
+
+
+def _zip_file(z, path, arcname, level, blobs, seen):
+    """
+    Add path to a deflated archive. Output files are copies of a few
+    sources, so a content's deflate stream is kept once its digest has been
+    seen twice and reused for every later copy. Contents that only occur
+    once are never cached, and the cache stops growing at BLOB_CACHE_LIMIT.
+    """
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    if zinfo.file_size > PRECOMPRESS_LIMIT:
+        z.write(path, arcname)
         return
 
-    for i in range(0, len(files), chunk_size):
-        zip_name = f"{output_dir.name}_part{i//chunk_size+1}.zip"
-        zip_path = output_dir.parent / zip_name
-
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as z:
-            for f in files[i:i + chunk_size]:
-                z.write(f, f.relative_to(output_dir))
+    with open(path, "rb") as f:
+        data = f.read()
+
+    key = hashlib.blake2b(data).digest()
+    entry = blobs.get(key)
+    if entry is None:
+        entry = (_deflate(data, level), zlib.crc32(data))
+        if key not in seen:
+            seen.add(key)
+        elif sum(len(b) for b, _ in blobs.values()) + len(entry[0]) <= BLOB_CACHE_LIMIT:
+            blobs[key] = entry
+
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.compress_size = len(entry[0])
+    zinfo.CRC = entry[1]
+    _write_precompressed(z, zinfo, entry[0])
+
+
+def walk_files(root, prefix=""):
+    """Yield (path, arcname) for every file under root, in directory order."""
+    with os.scandir(root) as it:
+        for entry in it:
+            arcname = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk_files(entry.path, arcname + "/")
+            elif entry.is_file() and not entry.name.startswith(RESUME_FILE):
+                yield entry.path, arcname
+
+
+def zip_chunks(output_dir, chunk_size, compression="deflate"):
+    method, level = ZIP_COMPRESSION[compression]
+    if level is None:
+        level = zlib.Z_DEFAULT_COMPRESSION
+    blobs = {}
+    seen = set()
+
+    z = None
+    part = count = 0
+    try:
+        for path, arcname in walk_files(output_dir):
+            if z is None or count == chunk_size:
+                if z is not None:
+                    z.close()
+                part += 1
+                count = 0
+                zip_path = output_dir.parent / f"{output_dir.name}_part{part}.zip"
+                z = zipfile.ZipFile(zip_path, "w", method, compresslevel=level)
+
+            if method == zipfile.ZIP_DEFLATED:
+                _zip_file(z, path, arcname, level, blobs, seen)
+            else:
+                z.write(path, arcname)
+            count += 1
+    finally:
+        if z is not None:
+            z.close()
 
 
 # -----------------------------
@@ -177,11 +889,18 @@ def main():
     parser.add_argument("--copies", type=int, help="Copies per source")
     parser.add_argument("--output", help="Output directory")
     parser.add_argument("--per-subfolder", type=int, default=0)
-    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--workers", type=int, help="Parallel workers (default: auto)")
+    parser.add_argument("--mode", choices=list(COPIERS), default="copy",
+                        help="hardlink/symlink share one inode: editing one copy edits all")
+    parser.add_argument("--backend", choices=["fastcopy", "uring"], default="fastcopy",
+                        help="uring batches opens/writes through io_uring (needs liburing)")
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--resume", action="store_true")
     parser.add_argument("--randomize", action="store_true")
+    parser.add_argument("--uuid-strict", action="store_true",
+                        help="Use RFC 4122 uuid4 hex for randomized names")
     parser.add_argument("--zip", action="store_true")
+    parser.add_argument("--zip-compression", choices=list(ZIP_COMPRESSION), default="deflate")
     parser.add_argument("--chunk-size", type=int, default=5000)
     parser.add_argument("--max-limit", type=int, default=50000)
 
@@ -195,32 +914,50 @@ def main():
         args.copies = int(prompt("Copies per source", is_positive_int))
         args.output = prompt("Output directory")
         args.per_subfolder = int(prompt("Files per subfolder (0 = none)", is_positive_int, 0))
-        args.workers = int(prompt("Parallel workers", is_positive_int, 4))
+        args.workers = int(prompt("Parallel workers (0 = auto)", is_positive_int, 0))
         args.dry_run = prompt("Dry-run? (y/n)", lambda x: x.lower() in ["y", "n"], "n") == "y"
         args.resume = prompt("Resume mode? (y/n)", lambda x: x.lower() in ["y", "n"], "n") == "y"
         args.randomize = prompt("Randomize filenames? (y/n)", lambda x: x.lower() in ["y", "n"], "n") == "y"
         args.zip = prompt("Zip output? (y/n)", lambda x: x.lower() in ["y", "n"], "n") == "y"
+        if args.zip:
+            args.zip_compression = prompt(
+                "ZIP compression (stored/deflate/deflate-fast)",
+                lambda x: x in ZIP_COMPRESSION,
+                "deflate",
+            )
         args.chunk_size = int(prompt("ZIP chunk size", is_positive_int, 5000))
         args.max_limit = int(prompt("Max safety limit", is_positive_int, 50000))
 
     sources = [s.strip() for s in args.sources.split(",")]
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
+    workers = pick_workers(output_dir, args.workers)
+
+    if args.mode == "reflink" and fcntl is None:
+        die("--mode reflink needs Linux")
+
+    backend = args.backend
+    if backend == "uring" and not uring_available():
+        print("INFO: io_uring unavailable (needs Linux and liburing), using fastcopy")
+        backend = "fastcopy"
 
     completed = generate_files(
         sources=sources,
         copies=args.copies,
         output_dir=output_dir,
         per_subfolder=args.per_subfolder,
-        workers=args.workers,
+        workers=workers,
         dry_run=args.dry_run,
         resume=args.resume,
         randomize=args.randomize,
         max_limit=args.max_limit,
+        uuid_strict=args.uuid_strict,
+        backend=backend,
+        mode=args.mode,
     )
 
     if args.zip and not args.dry_run:
-        zip_chunks(output_dir, args.chunk_size)
+        zip_chunks(output_dir, args.chunk_size, args.zip_compression)
 
     print(f"SUCCESS: {len(completed)} files processed")
 
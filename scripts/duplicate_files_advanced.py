@@ -15,7 +15,7 @@ def to_bool(v):
     return v.lower() == "true"
 
 # -------------------- Args --------------------
-if len(sys.argv) != 11:
+if len(sys.argv) != 10:
     error("Invalid arguments")
 
 (
@@ -70,6 +70,19 @@ if dry_run:
 
 os.makedirs(target_folder, exist_ok=True)
 
+# -------------------- Folders --------------------
+if per_subfolder > 0:
+    folders = [
+        os.path.join(target_folder, f"part_{idx}")
+        for idx in range(1, (copies - 1) // per_subfolder + 2)
+    ]
+else:
+    folders = [target_folder]
+
+if not dry_run:
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+
 # -------------------- Build tasks --------------------
 tasks = []
 
@@ -80,12 +93,7 @@ for src in sources:
     for i in range(1, copies + 1):
         folder = target_folder
         if per_subfolder > 0:
-            folder = os.path.join(
-                target_folder,
-                f"part_{((i - 1) // per_subfolder) + 1}",
-            )
-
-        os.makedirs(folder, exist_ok=True)
+            folder = folders[(i - 1) // per_subfolder]
 
         filename = (
             f"{uuid.uuid4().hex}{ext}"
@@ -109,6 +117,8 @@ with ThreadPoolExecutor(max_workers=workers) as executor:
             total=len(tasks),
             desc="Generating files",
             unit="files",
+            mininterval=0.5,
+            miniters=max(1, len(tasks) // 200),
         )
     )
 